@@ -14,9 +14,30 @@
 
 import logging
 import random
-from dataclasses import replace
+import weakref
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import lru_cache
+from itertools import islice
 from time import time_ns
-from typing import Dict, List, NoReturn, Optional, Set, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import google.auth
 from google.api.distribution_pb2 import (  # pylint: disable=no-name-in-module
@@ -46,6 +67,8 @@ from google.cloud.monitoring_v3 import (
 from google.cloud.monitoring_v3.services.metric_service.transports.grpc import (
     MetricServiceGrpcTransport,
 )
+from google.protobuf.internal import api_implementation
+from google.protobuf.message import Message
 
 # pylint: disable=no-name-in-module
 from google.protobuf.timestamp_pb2 import Timestamp
@@ -65,13 +88,33 @@ from opentelemetry.sdk.metrics.export import (
     NumberDataPoint,
     Sum,
 )
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.util.types import AttributeValue
 
 logger = logging.getLogger(__name__)
 MAX_BATCH_WRITE = 200
+# Maximum number of CreateTimeSeries requests in flight at once
+MAX_CONCURRENT_WRITES = 5
 WRITE_INTERVAL = 10
 UNIQUE_IDENTIFIER_KEY = "opentelemetry_id"
 NANOS_PER_SECOND = 10**9
 
+# DELTA should never happen but is included to be future proof
+_KINDS_WITH_START_TIME = frozenset(
+    (
+        MetricDescriptor.MetricKind.CUMULATIVE,
+        MetricDescriptor.MetricKind.DELTA,
+    )
+)
+
+# The proto-plus wrappers are several times slower to construct than the raw
+# protobuf messages underneath them, so TimeSeries are built from the raw
+# messages. CreateTimeSeriesRequest accepts them as is.
+_Point = Point.pb()
+_TimeInterval = TimeInterval.pb()
+_TimeSeries = TimeSeries.pb()
+_TypedValue = TypedValue.pb()
+
 _OTEL_SDK_VERSION = opentelemetry_sdk_version.__version__
 _USER_AGENT = f"opentelemetry-python {_OTEL_SDK_VERSION}; google-cloud-metric-exporter {__version__}"
 
@@ -117,6 +160,14 @@ class CloudMonitoringMetricsExporter(MetricExporter):
         # Default preferred_temporality is all CUMULATIVE so need to customize
         super().__init__()
 
+        if api_implementation.Type() == "python":
+            logger.warning(
+                "The pure-Python protobuf implementation is in use, which makes "
+                "exporting metrics significantly slower. Upgrade to protobuf>=4.21 "
+                "and unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION to use the "
+                "upb backend."
+            )
+
         self.client = client or MetricServiceClient(
             transport=MetricServiceGrpcTransport(
                 channel=MetricServiceGrpcTransport.create_channel(
@@ -131,7 +182,16 @@ class CloudMonitoringMetricsExporter(MetricExporter):
         else:
             self.project_id = project_id
         self.project_name = self.client.common_project_path(self.project_id)
+        # Keyed by metric name rather than descriptor type: the prefix is
+        # fixed per exporter, and this avoids formatting the type each export
         self._metric_descriptors: Dict[str, MetricDescriptor] = {}
+        # Keyed by id() because Resource.__hash__ serializes all attributes
+        # to JSON. The weakref guards against a recycled id() and evicts the
+        # entry once the Resource is garbage collected.
+        self._monitored_resources: Dict[
+            int,
+            Tuple["weakref.ref[Resource]", Optional[MonitoredResource]],
+        ] = {}
         self.unique_identifier = None
         if add_unique_identifier:
             self.unique_identifier = "{:08x}".format(
@@ -143,39 +203,129 @@ class CloudMonitoringMetricsExporter(MetricExporter):
             self._exporter_start_time_nanos,
         ) = divmod(time_ns(), NANOS_PER_SECOND)
         self._prefix = prefix
+        self._shutdown = False
+        # Threads are only started once an export needs more than one batch.
+        # The pool lives as long as the exporter and is shut down in shutdown()
+        # pylint: disable=consider-using-with
+        self._executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_WRITES,
+            thread_name_prefix="CloudMonitoringMetricsExporter",
+        )
+        # pylint: enable=consider-using-with
 
-    def _batch_write(self, series: List[TimeSeries]) -> None:
+    def _batch_write(self, series: Iterable[Message]) -> None:
         """Cloud Monitoring allows writing up to 200 time series at once
 
+        series is consumed lazily, and each batch is sent as soon as it is
+        full so that building the remaining TimeSeries overlaps with the
+        requests already in flight. At most MAX_CONCURRENT_WRITES batches are
+        in flight at once; building the next batch waits for one of them to
+        complete, so only a bounded number of batches is held in memory. If
+        any batch fails, the first error seen is raised once all batches are
+        done.
+
         :param series: ProtoBuf TimeSeries
         :return:
         """
-        write_ind = 0
-        while write_ind < len(series):
-            self.client.create_time_series(
-                CreateTimeSeriesRequest(
-                    name=self.project_name,
-                    time_series=series[
-                        write_ind : write_ind + MAX_BATCH_WRITE
-                    ],
-                ),
+        series_iter = iter(series)
+        batch = list(islice(series_iter, MAX_BATCH_WRITE))
+        if len(batch) < MAX_BATCH_WRITE:
+            if batch:
+                self._write_batch(batch)
+            return
+
+        pending: Set["Future[None]"] = set()
+        errors: List[BaseException] = []
+        num_batches = 0
+        try:
+            while batch:
+                if len(pending) >= MAX_CONCURRENT_WRITES:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    errors.extend(_batch_errors(done))
+                pending.add(self._executor.submit(self._write_batch, batch))
+                num_batches += 1
+                batch = list(islice(series_iter, MAX_BATCH_WRITE))
+        finally:
+            done, _ = wait(pending)
+            errors.extend(_batch_errors(done))
+
+        if len(errors) > 1:
+            logger.error(
+                "%d of %d batches failed to write to Cloud Monitoring, "
+                "raising the first error",
+                len(errors),
+                num_batches,
             )
-            write_ind += MAX_BATCH_WRITE
+            # Only the first error is raised, so log the details of the others
+            for error in errors[1:]:
+                logger.error(
+                    "Error while writing a batch to Cloud Monitoring",
+                    exc_info=error,
+                )
+        if errors:
+            raise errors[0]
+
+    def _write_batch(self, batch: List[Message]) -> None:
+        self.client.create_time_series(
+            CreateTimeSeriesRequest(
+                name=self.project_name,
+                time_series=batch,
+            ),
+        )
+
+    def _get_monitored_resource(
+        self, resource: Resource
+    ) -> Optional[MonitoredResource]:
+        """Maps the OTel Resource to a MonitoredResource proto, caching the
+        result per Resource object since they are typically reused across
+        exports."""
+        cached = self._monitored_resources.get(id(resource))
+        if cached is not None and cached[0]() is resource:
+            return cached[1]
+
+        monitored_resource_data = get_monitored_resource(resource)
+        # convert it to proto
+        monitored_resource = (
+            MonitoredResource(
+                type=monitored_resource_data.type,
+                labels=monitored_resource_data.labels,
+            )
+            if monitored_resource_data
+            else None
+        )
+        key = id(resource)
+        cache = self._monitored_resources
+
+        def evict(ref: "weakref.ref[Resource]") -> None:
+            # Only drop the entry if it still belongs to the collected
+            # Resource
+            entry = cache.get(key)
+            if entry is not None and entry[0] is ref:
+                cache.pop(key, None)
+
+        cache[key] = (weakref.ref(resource, evict), monitored_resource)
+        return monitored_resource
 
     def _get_metric_descriptor(
-        self, metric: Metric
+        self,
+        metric: Metric,
+        data_points: Sequence[Union[NumberDataPoint, HistogramDataPoint]],
     ) -> Optional[MetricDescriptor]:
         """We can map Metric to MetricDescriptor using Metric.name or
         MetricDescriptor.type. We create the MetricDescriptor if it doesn't
         exist already and cache it. Note that recreating MetricDescriptors is
         a no-op if it already exists.
 
-        :param record:
+        :param metric:
+        :param data_points: the metric's data points, materialized as a
+            Sequence
         :return:
         """
+        cached_descriptor = self._metric_descriptors.get(metric.name)
+        if cached_descriptor is not None:
+            return cached_descriptor
+
         descriptor_type = f"{self._prefix}/{metric.name}"
-        if descriptor_type in self._metric_descriptors:
-            return self._metric_descriptors[descriptor_type]
 
         descriptor = MetricDescriptor(
             type=descriptor_type,
@@ -184,7 +334,7 @@ class CloudMonitoringMetricsExporter(MetricExporter):
             unit=metric.unit or "",
         )
         seen_keys: Set[str] = set()
-        for data_point in metric.data.data_points:
+        for data_point in data_points:
             for key in data_point.attributes or {}:
                 if key in seen_keys:
                     continue
@@ -218,7 +368,7 @@ class CloudMonitoringMetricsExporter(MetricExporter):
             )
             return None
 
-        first_point = data.data_points[0] if len(data.data_points) else None
+        first_point = data_points[0] if data_points else None
         if isinstance(first_point, NumberDataPoint):
             descriptor.value_type = (
                 MetricDescriptor.ValueType.INT64
@@ -251,124 +401,112 @@ class CloudMonitoringMetricsExporter(MetricExporter):
                 exc_info=ex,
             )
             return None
-        self._metric_descriptors[descriptor_type] = response_descriptor
+        self._metric_descriptors[metric.name] = response_descriptor
         return descriptor
 
     @staticmethod
     def _to_point(
         kind: "MetricDescriptor.MetricKind.V",
         data_point: Union[NumberDataPoint, HistogramDataPoint],
-    ) -> Point:
-        if isinstance(data_point, HistogramDataPoint):
-            mean = (
-                data_point.sum / data_point.count if data_point.count else 0.0
-            )
-            point_value = TypedValue(
-                distribution_value=Distribution(
-                    count=data_point.count,
-                    mean=mean,
-                    bucket_counts=data_point.bucket_counts,
-                    bucket_options=Distribution.BucketOptions(
-                        explicit_buckets=Distribution.BucketOptions.Explicit(
-                            bounds=data_point.explicit_bounds,
-                        )
-                    ),
-                )
-            )
-        else:
-            if isinstance(data_point.value, int):
-                point_value = TypedValue(int64_value=data_point.value)
-            else:
-                point_value = TypedValue(double_value=data_point.value)
-
-            if kind is MetricDescriptor.MetricKind.CUMULATIVE:
-                pass
-
-        # DELTA case should never happen but adding it to be future proof
-        if (
-            kind is MetricDescriptor.MetricKind.CUMULATIVE
-            or kind is MetricDescriptor.MetricKind.DELTA
-        ):
-            interval = TimeInterval(
-                start_time=_timestamp_from_nanos(
-                    data_point.start_time_unix_nano
+        to_typed_value: Callable[[Any], Message],
+        timestamps: Dict[int, Timestamp],
+    ) -> Message:
+        point_value = to_typed_value(data_point)
+
+        if kind in _KINDS_WITH_START_TIME:
+            interval = _TimeInterval(
+                start_time=_cached_timestamp(
+                    timestamps, data_point.start_time_unix_nano
+                ),
+                end_time=_cached_timestamp(
+                    timestamps, data_point.time_unix_nano
                 ),
-                end_time=_timestamp_from_nanos(data_point.time_unix_nano),
             )
         else:
-            interval = TimeInterval(
-                end_time=_timestamp_from_nanos(data_point.time_unix_nano),
+            interval = _TimeInterval(
+                end_time=_cached_timestamp(
+                    timestamps, data_point.time_unix_nano
+                ),
             )
-        return Point(interval=interval, value=point_value)
+        return _Point(interval=interval, value=point_value)
 
-    def export(
-        self,
-        metrics_data: MetricsData,
-        # TODO(aabmass): pass timeout to api calls
-        timeout_millis: float = 10_000,
-        **kwargs,
-    ) -> MetricExportResult:
-        all_series = []
+    def _to_time_series(self, metrics_data: MetricsData) -> Iterator[Message]:
+        # Points collected together share timestamps, so convert each distinct
+        # value only once per export. The protos are copied into each
+        # TimeInterval, so sharing them is safe.
+        timestamps: Dict[int, Timestamp] = {}
+        unique_identifier = self.unique_identifier
+        to_point = self._to_point
 
         for resource_metric in metrics_data.resource_metrics:
-            monitored_resource_data = get_monitored_resource(
+            monitored_resource = self._get_monitored_resource(
                 resource_metric.resource
             )
-            # convert it to proto
-            monitored_resource = (
-                MonitoredResource(
-                    type=monitored_resource_data.type,
-                    labels=monitored_resource_data.labels,
-                )
-                if monitored_resource_data
-                else None
-            )
 
             for scope_metric in resource_metric.scope_metrics:
                 for metric in scope_metric.metrics:
                     # Convert all data_points to Sequences, see
                     # https://github.com/open-telemetry/opentelemetry-python/issues/3021.
                     # TODO(aabmass): remove once the issue is fixed upstream
-                    metric = replace(
-                        metric,
-                        data=replace(
-                            metric.data,
-                            data_points=tuple(metric.data.data_points),
-                        ),
-                    )
+                    data_points: Tuple[
+                        Union[NumberDataPoint, HistogramDataPoint], ...
+                    ] = tuple(metric.data.data_points)
 
-                    descriptor = self._get_metric_descriptor(metric)
+                    descriptor = self._get_metric_descriptor(
+                        metric, data_points
+                    )
                     if not descriptor:
                         continue
 
-                    for data_point in metric.data.data_points:
+                    # Resolve everything that is constant for the metric once
+                    # instead of once per point
+                    to_typed_value: Callable[[Any], Message]
+                    if isinstance(metric.data, Histogram):
+                        to_typed_value = _histogram_to_typed_value
+                    else:
+                        to_typed_value = _number_to_typed_value
+                    metric_kind = descriptor.metric_kind
+                    metric_type = descriptor.type
+                    unit = descriptor.unit
+                    for data_point in data_points:
                         labels = {
-                            _normalize_label_key(key): str(value)
+                            _normalize_label_key(key): _label_value(value)
                             for key, value in (
                                 data_point.attributes or {}
                             ).items()
                         }
-                        if self.unique_identifier:
-                            labels[
-                                UNIQUE_IDENTIFIER_KEY
-                            ] = self.unique_identifier
-                        point = self._to_point(
-                            descriptor.metric_kind, data_point
+                        if unique_identifier:
+                            labels[UNIQUE_IDENTIFIER_KEY] = unique_identifier
+                        point = to_point(
+                            metric_kind,
+                            data_point,
+                            to_typed_value,
+                            timestamps,
                         )
-                        series = TimeSeries(
+                        series = _TimeSeries(
                             resource=monitored_resource,
-                            metric_kind=descriptor.metric_kind,
+                            metric_kind=metric_kind,
                             points=[point],
                             metric=GMetric(
-                                type=descriptor.type,
+                                type=metric_type,
                                 labels=labels,
                             ),
-                            unit=descriptor.unit,
+                            unit=unit,
                         )
-                        all_series.append(series)
+                        yield series
 
+    def export(
+        self,
+        metrics_data: MetricsData,
+        # TODO(aabmass): pass timeout to api calls
+        timeout_millis: float = 10_000,
+        **kwargs,
+    ) -> MetricExportResult:
+        if self._shutdown:
+            logger.warning("Exporter already shutdown, ignoring batch")
+            return MetricExportResult.FAILURE
         try:
-            self._batch_write(all_series)
+            self._batch_write(self._to_time_series(metrics_data))
         # pylint: disable=broad-except
         except Exception as ex:
             logger.error(
@@ -381,7 +519,52 @@ class CloudMonitoringMetricsExporter(MetricExporter):
         return True
 
     def shutdown(self, timeout_millis: float = 30_000, **kwargs) -> None:
-        pass
+        """Rejects any further exports, without blocking
+
+        An export still running on another thread waits for its own batch
+        writes to complete, so there is nothing left for shutdown to wait on.
+        """
+        self._shutdown = True
+        self._executor.shutdown(wait=False)
+
+
+def _batch_errors(futures: Iterable["Future[None]"]) -> List[BaseException]:
+    return [
+        error
+        for error in (future.exception() for future in futures)
+        if error is not None
+    ]
+
+
+def _histogram_to_typed_value(data_point: HistogramDataPoint) -> Message:
+    mean = data_point.sum / data_point.count if data_point.count else 0.0
+    return _TypedValue(
+        distribution_value=Distribution(
+            count=data_point.count,
+            mean=mean,
+            bucket_counts=data_point.bucket_counts,
+            bucket_options=_bucket_options(tuple(data_point.explicit_bounds)),
+        )
+    )
+
+
+@lru_cache(maxsize=128)
+def _bucket_options(bounds: Tuple[float, ...]) -> Distribution.BucketOptions:
+    """Builds the BucketOptions for the given bounds
+
+    Histograms almost always share a few sets of bounds, so the proto is
+    cached. It must not be mutated: it is only ever passed to message
+    constructors, which copy it.
+    """
+    return Distribution.BucketOptions(
+        explicit_buckets=Distribution.BucketOptions.Explicit(bounds=bounds)
+    )
+
+
+def _number_to_typed_value(data_point: NumberDataPoint) -> Message:
+    if isinstance(data_point.value, int):
+        return _TypedValue(int64_value=data_point.value)
+    return _TypedValue(double_value=data_point.value)
 
 
 def _timestamp_from_nanos(nanos: int) -> Timestamp:
@@ -390,6 +573,23 @@ def _timestamp_from_nanos(nanos: int) -> Timestamp:
     return ts
 
 
+def _cached_timestamp(
+    timestamps: Dict[int, Timestamp], nanos: int
+) -> Timestamp:
+    ts = timestamps.get(nanos)
+    if ts is None:
+        ts = timestamps[nanos] = _timestamp_from_nanos(nanos)
+    return ts
+
+
+def _label_value(value: AttributeValue) -> str:
+    """Converts an attribute value to a label value string, returning
+    strings, the common case, as is."""
+    # pylint: disable=unidiomatic-typecheck
+    return value if type(value) is str else str(value)
+
+
+@lru_cache(maxsize=1024)
 def _normalize_label_key(key: str) -> str:
     """Makes the key into a valid GCM label key
 
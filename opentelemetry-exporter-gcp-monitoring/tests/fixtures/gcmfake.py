@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
@@ -64,7 +65,8 @@ PROJECT_ID = "fakeproject"
 class FakeHandler(GenericRpcHandler):
     """gRPC handler partially implementing the GCM API and capturing the requests.
 
-    Captures the request protos made to each method.
+    Captures the request protos made to each method, as raw protobuf messages
+    rather than proto-plus wrappers. Safe to use from a multi-threaded server.
     """
 
     _service = "google.monitoring.v3.MetricService"
@@ -73,6 +75,7 @@ class FakeHandler(GenericRpcHandler):
         # pylint: disable=no-member
         super().__init__()
         self._calls: GcmCalls = defaultdict(list)
+        self._calls_lock = threading.Lock()
 
         self._wrapped = method_handlers_generic_handler(
             self._service,
@@ -81,14 +84,14 @@ class FakeHandler(GenericRpcHandler):
                     self._make_impl(
                         "CreateTimeSeries",
                         lambda req, ctx: Empty(),
-                        CreateTimeSeriesRequest.deserialize,
+                        CreateTimeSeriesRequest.pb().FromString,
                         Empty.SerializeToString,
                     ),
                     self._make_impl(
                         "CreateMetricDescriptor",
                         # return the metric descriptor back
                         lambda req, ctx: req.metric_descriptor,
-                        CreateMetricDescriptorRequest.deserialize,
+                        CreateMetricDescriptorRequest.pb().FromString,
                         MetricDescriptor.SerializeToString,
                     ),
                 ]
@@ -102,27 +105,43 @@ class FakeHandler(GenericRpcHandler):
         deserializer,
         serializer,
     ) -> Tuple[str, RpcMethodHandler]:
-        def impl(req: Message, context: ServicerContext) -> Message:
-            metadata_dict = dict(context.invocation_metadata())
-            user_agent = cast(str, metadata_dict["user-agent"])
-            self._calls[f"/{self._service}/{method}"].append(
-                GcmCall(message=req, user_agent=user_agent)
-            )
-            return behavior(req, context)
-
         return method, unary_unary_rpc_method_handler(
-            impl,
+            partial(self._dispatch, f"/{self._service}/{method}", behavior),
             request_deserializer=deserializer,
             response_serializer=serializer,
         )
 
+    def _dispatch(
+        self,
+        method_path: str,
+        behavior: Callable[[Message, ServicerContext], Message],
+        req: Message,
+        context: ServicerContext,
+    ) -> Message:
+        user_agent = next(
+            (
+                cast(str, value)
+                for key, value in context.invocation_metadata()
+                if key == "user-agent"
+            ),
+            "",
+        )
+        with self._calls_lock:
+            self._calls[method_path].append(
+                GcmCall(message=req, user_agent=user_agent)
+            )
+        return behavior(req, context)
+
     def service(self, handler_call_details):
         res = self._wrapped.service(handler_call_details)
         return res
 
     def get_calls(self) -> GcmCalls:
         """Returns calls made to each GCM API method"""
-        return self._calls
+        with self._calls_lock:
+            return {
+                method: list(calls) for method, calls in self._calls.items()
+            }
 
 
 @dataclass
@@ -132,15 +151,21 @@ class GcmFake:
 
 
 @pytest.fixture(name="gcmfake")
-def fixture_gcmfake() -> Iterable[GcmFake]:
-    """Fixture providing faked GCM api with captured requests"""
+def fixture_gcmfake(request: pytest.FixtureRequest) -> Iterable[GcmFake]:
+    """Fixture providing faked GCM api with captured requests
+
+    The server handles requests in a single thread by default, which
+    serializes them. Tests exercising concurrent requests can set the number
+    of server threads with indirect parametrization, e.g.
+    ``@pytest.mark.parametrize("gcmfake", [4], indirect=True)``.
+    """
 
     handler = FakeHandler()
     server = None
+    max_workers: int = getattr(request, "param", 1)
 
     try:
-        # Run in a single thread to serialize requests
-        with ThreadPoolExecutor(1) as executor:
+        with ThreadPoolExecutor(max_workers) as executor:
             server = grpc.server(executor, handlers=[handler])
             port = server.add_insecure_port("localhost:0")
             server.start()
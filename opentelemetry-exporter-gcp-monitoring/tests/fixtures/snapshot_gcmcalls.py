@@ -15,7 +15,6 @@
 from typing import Optional, cast
 
 import google.protobuf.message
-import proto
 import pytest
 from fixtures.gcmfake import GcmCalls
 from google.protobuf import json_format
@@ -48,13 +47,11 @@ class GcmCallsSnapshotExtension(JSONSnapshotExtension):
         for method, calls in gcmcalls.items():
             dict_requests = []
             for call in calls:
-                if isinstance(call.message, proto.message.Message):
-                    call.message = type(call.message).pb(call.message)
-                elif isinstance(call.message, google.protobuf.message.Message):
-                    pass
-                else:
+                if not isinstance(
+                    call.message, google.protobuf.message.Message
+                ):
                     raise ValueError(
-                        f"Excepted a proto-plus or protobuf message, got {type(call)}"
+                        f"Excepted a protobuf message, got {type(call.message)}"
                     )
                 dict_requests.append(json_format.MessageToDict(call.message))
             json[method] = dict_requests
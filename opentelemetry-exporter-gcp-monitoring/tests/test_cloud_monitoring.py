@@ -28,16 +28,25 @@ tox -e py310-ci-test-cloudmonitoring -- --snapshot-update
 Be sure to review the changes.
 """
 
-from typing import List, Union
+import gc
+import threading
+import time
+from typing import Iterator, List, Union
+from unittest.mock import MagicMock, patch
 
 import pytest
 from fixtures.gcmfake import GcmFake, GcmFakeMeterProvider
 from google.auth.credentials import AnonymousCredentials
-from google.cloud.monitoring_v3 import MetricServiceClient
+from google.cloud.monitoring_v3 import MetricServiceClient, TimeSeries
 from opentelemetry.exporter.cloud_monitoring import (
+    MAX_BATCH_WRITE,
+    MAX_CONCURRENT_WRITES,
     CloudMonitoringMetricsExporter,
 )
 from opentelemetry.metrics import CallbackOptions, Observation
+from opentelemetry.resourcedetector.gcp_resource_detector._mapping import (
+    get_monitored_resource,
+)
 from opentelemetry.sdk.metrics.view import (
     ExplicitBucketHistogramAggregation,
     View,
@@ -63,6 +72,16 @@ def test_create_monitoring_exporter() -> None:
     )
 
 
+def test_warns_on_pure_python_protobuf(caplog) -> None:
+    client = MetricServiceClient(credentials=AnonymousCredentials())
+    with patch(
+        "opentelemetry.exporter.cloud_monitoring.api_implementation.Type",
+        return_value="python",
+    ):
+        CloudMonitoringMetricsExporter(project_id=PROJECT_ID, client=client)
+    assert "pure-Python protobuf implementation" in caplog.text
+
+
 @pytest.mark.parametrize(
     "value", [pytest.param(123, id="int"), pytest.param(45.6, id="float")]
 )
@@ -247,3 +266,144 @@ def test_with_resource(
     counter.add(12, LABELS)
     meter_provider.force_flush()
     assert gcmfake.get_calls() == snapshot_gcmcalls
+
+
+@pytest.mark.parametrize("gcmfake", [4], indirect=True)
+def test_batch_write_many_series(
+    gcmfake_meter_provider: GcmFakeMeterProvider,
+    gcmfake: GcmFake,
+) -> None:
+    meter_provider = gcmfake_meter_provider()
+    counter = meter_provider.get_meter(__name__).create_counter(
+        "mycounter", description="foo", unit="{myunit}"
+    )
+    for idx in range(450):
+        counter.add(1, {"id": idx})
+    meter_provider.force_flush()
+
+    calls = gcmfake.get_calls()[
+        "/google.monitoring.v3.MetricService/CreateTimeSeries"
+    ]
+    # Batches are written concurrently so the calls may arrive in any order
+    assert sorted(len(call.message.time_series) for call in calls) == [
+        50,
+        200,
+        200,
+    ]
+    assert {
+        series.metric.labels["id"]
+        for call in calls
+        for series in call.message.time_series
+    } == {str(idx) for idx in range(450)}
+
+
+def test_monitored_resource_cached(
+    gcmfake_meter_provider: GcmFakeMeterProvider,
+) -> None:
+    meter_provider = gcmfake_meter_provider()
+    counter = meter_provider.get_meter(__name__).create_counter(
+        "mycounter", description="foo", unit="{myunit}"
+    )
+    with patch(
+        "opentelemetry.exporter.cloud_monitoring.get_monitored_resource",
+        wraps=get_monitored_resource,
+    ) as mock_get_monitored_resource:
+        for _ in range(3):
+            counter.add(1, LABELS)
+            meter_provider.force_flush()
+    mock_get_monitored_resource.assert_called_once()
+
+
+def test_batch_write_raises_after_all_batches(caplog) -> None:
+    client = MagicMock(spec=MetricServiceClient)
+    client.common_project_path.return_value = f"projects/{PROJECT_ID}"
+    client.create_time_series.side_effect = ValueError("write failed")
+    exporter = CloudMonitoringMetricsExporter(
+        project_id=PROJECT_ID, client=client
+    )
+
+    with pytest.raises(ValueError, match="write failed"):
+        exporter._batch_write(  # pylint: disable=protected-access
+            [TimeSeries()] * 450
+        )
+    assert client.create_time_series.call_count == 3
+    assert "3 of 3 batches failed" in caplog.text
+    # the errors that aren't raised are logged with their details
+    logged_errors = [
+        record.exc_info[1] for record in caplog.records if record.exc_info
+    ]
+    assert logged_errors == [client.create_time_series.side_effect] * 2
+    exporter.shutdown()
+
+
+def test_batch_write_bounds_batches_in_flight() -> None:
+    written = 0
+    lock = threading.Lock()
+
+    def create_time_series(_request) -> None:
+        nonlocal written
+        time.sleep(0.01)
+        with lock:
+            written += 1
+
+    client = MagicMock(spec=MetricServiceClient)
+    client.common_project_path.return_value = f"projects/{PROJECT_ID}"
+    client.create_time_series.side_effect = create_time_series
+    exporter = CloudMonitoringMetricsExporter(
+        project_id=PROJECT_ID, client=client
+    )
+
+    max_batches_ahead = 0
+
+    def series() -> Iterator[TimeSeries]:
+        nonlocal max_batches_ahead
+        for index in range(20 * MAX_BATCH_WRITE):
+            if index % MAX_BATCH_WRITE == 0:
+                with lock:
+                    max_batches_ahead = max(
+                        max_batches_ahead, index // MAX_BATCH_WRITE - written
+                    )
+            yield TimeSeries()
+
+    exporter._batch_write(series())  # pylint: disable=protected-access
+    assert client.create_time_series.call_count == 20
+    # the batch being built plus the ones waiting to be written
+    assert max_batches_ahead <= MAX_CONCURRENT_WRITES
+    exporter.shutdown()
+
+
+def test_monitored_resource_cache_evicted() -> None:
+    client = MagicMock(spec=MetricServiceClient)
+    client.common_project_path.return_value = f"projects/{PROJECT_ID}"
+    exporter = CloudMonitoringMetricsExporter(
+        project_id=PROJECT_ID, client=client
+    )
+    # pylint: disable=protected-access
+    resource = Resource.create({"service.name": "foo"})
+    exporter._get_monitored_resource(resource)
+    assert len(exporter._monitored_resources) == 1
+
+    del resource
+    gc.collect()
+    assert not exporter._monitored_resources
+    exporter.shutdown()
+
+
+@pytest.mark.parametrize("num_series", [1, 450])
+def test_export_after_shutdown(
+    gcmfake_meter_provider: GcmFakeMeterProvider,
+    gcmfake: GcmFake,
+    caplog,
+    num_series: int,
+) -> None:
+    meter_provider = gcmfake_meter_provider()
+    counter = meter_provider.get_meter(__name__).create_counter(
+        "mycounter", description="foo", unit="{myunit}"
+    )
+    for idx in range(num_series):
+        counter.add(1, {"id": idx})
+    gcmfake.exporter.shutdown()
+    meter_provider.force_flush()
+
+    assert not gcmfake.get_calls()
+    assert "Exporter already shutdown" in caplog.text
@@ -0,0 +1,37 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from opentelemetry.exporter.cloud_monitoring import _label_value
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("string", "string"),
+        (123, "123"),
+        (123.4, "123.4"),
+        (True, "True"),
+        (1, "1"),
+        (1.0, "1.0"),
+        (0.0, "0.0"),
+        (-0.0, "-0.0"),
+        ((1, 2), "(1, 2)"),
+        ((True,), "(True,)"),
+        ((1,), "(1,)"),
+        ([1, 2], "[1, 2]"),
+    ],
+)
+def test_label_value(value, expected: str) -> None:
+    assert _label_value(value) == expected
@@ -14,7 +14,7 @@
 
 import json
 from dataclasses import dataclass
-from typing import Dict, Mapping, Optional, Tuple
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 from opentelemetry.resourcedetector.gcp_resource_detector import _constants
 from opentelemetry.resourcedetector.gcp_resource_detector._constants import (
@@ -132,6 +132,32 @@ MAPPINGS = {
     },
 }
 
+# MAPPINGS flattened into plain (mr_key, otel_keys, fallback) tuples, so that
+# _create_monitored_resource doesn't go through MapConfig attribute lookups for
+# every label of every resource it maps.
+_CompiledMapping = Tuple[Tuple[str, Tuple[str, ...], str], ...]
+_COMPILED_MAPPINGS: Dict[str, _CompiledMapping] = {
+    monitored_resource_type: tuple(
+        (mr_key, map_config.otel_keys, map_config.fallback)
+        for mr_key, map_config in mapping.items()
+    )
+    for monitored_resource_type, mapping in MAPPINGS.items()
+}
+
+# Monitored resource type for each cloud.platform that maps onto a single type
+_PLATFORM_TO_MR_TYPE: Dict[Any, str] = {
+    ResourceAttributes.GCP_COMPUTE_ENGINE: _constants.GCE_INSTANCE,
+    ResourceAttributes.AWS_EC2: _constants.AWS_EC2_INSTANCE,
+}
+
+# On GKE, the most specific k8s resource whose name attribute is present wins,
+# falling back to k8s_cluster
+_K8S_RESOURCE_ORDER = (
+    (ResourceAttributes.K8S_CONTAINER_NAME, _constants.K8S_CONTAINER),
+    (ResourceAttributes.K8S_POD_NAME, _constants.K8S_POD),
+    (ResourceAttributes.K8S_NODE_NAME, _constants.K8S_NODE),
+)
+
 
 @dataclass
 class MonitoredResourceData:
@@ -157,59 +183,52 @@ def get_monitored_resource(
     attrs = resource.attributes
 
     platform = attrs.get(ResourceAttributes.CLOUD_PLATFORM_KEY)
-    if platform == ResourceAttributes.GCP_COMPUTE_ENGINE:
-        mr = _create_monitored_resource(_constants.GCE_INSTANCE, attrs)
-    elif platform == ResourceAttributes.GCP_KUBERNETES_ENGINE:
-        if ResourceAttributes.K8S_CONTAINER_NAME in attrs:
-            mr = _create_monitored_resource(_constants.K8S_CONTAINER, attrs)
-        elif ResourceAttributes.K8S_POD_NAME in attrs:
-            mr = _create_monitored_resource(_constants.K8S_POD, attrs)
-        elif ResourceAttributes.K8S_NODE_NAME in attrs:
-            mr = _create_monitored_resource(_constants.K8S_NODE, attrs)
-        else:
-            mr = _create_monitored_resource(_constants.K8S_CLUSTER, attrs)
-    elif platform == ResourceAttributes.AWS_EC2:
-        mr = _create_monitored_resource(_constants.AWS_EC2_INSTANCE, attrs)
-    else:
+    mr_type = _PLATFORM_TO_MR_TYPE.get(platform)
+    if mr_type is None:
+        if platform == ResourceAttributes.GCP_KUBERNETES_ENGINE:
+            mr_type = _constants.K8S_CLUSTER
+            for otel_key, k8s_type in _K8S_RESOURCE_ORDER:
+                if otel_key in attrs:
+                    mr_type = k8s_type
+                    break
         # fallback to generic_task
-        if (
+        elif (
             ResourceAttributes.SERVICE_NAME in attrs
             or ResourceAttributes.FAAS_NAME in attrs
         ) and (
             ResourceAttributes.SERVICE_INSTANCE_ID in attrs
             or ResourceAttributes.FAAS_INSTANCE in attrs
         ):
-            mr = _create_monitored_resource(_constants.GENERIC_TASK, attrs)
+            mr_type = _constants.GENERIC_TASK
         else:
-            mr = _create_monitored_resource(_constants.GENERIC_NODE, attrs)
+            mr_type = _constants.GENERIC_NODE
 
-    return mr
+    return _create_monitored_resource(mr_type, attrs)
 
 
 def _create_monitored_resource(
     monitored_resource_type: str, resource_attrs: Attributes
 ) -> MonitoredResourceData:
-    mapping = MAPPINGS[monitored_resource_type]
     labels: Dict[str, str] = {}
 
-    for mr_key, map_config in mapping.items():
+    for mr_key, otel_keys, fallback in _COMPILED_MAPPINGS[
+        monitored_resource_type
+    ]:
         mr_value = None
-        for otel_key in map_config.otel_keys:
-            if otel_key in resource_attrs and not str(
-                resource_attrs[otel_key]
-            ).startswith(_constants.UNKNOWN_SERVICE_PREFIX):
-                mr_value = resource_attrs[otel_key]
+        for otel_key in otel_keys:
+            value = resource_attrs.get(otel_key)
+            if value is not None and not str(value).startswith(
+                _constants.UNKNOWN_SERVICE_PREFIX
+            ):
+                mr_value = value
                 break
 
-        if (
-            mr_value is None
-            and ResourceAttributes.SERVICE_NAME in map_config.otel_keys
-        ):
+        if mr_value is None and ResourceAttributes.SERVICE_NAME in otel_keys:
             # The service name started with unknown_service, and was ignored above.
             mr_value = resource_attrs.get(ResourceAttributes.SERVICE_NAME)
 
         if mr_value is None:
-            mr_value = map_config.fallback
+            mr_value = fallback
 
         # OTel attribute values can be any of str, bool, int, float, or Sequence of any of
         # them. Encode any non-strings as json string